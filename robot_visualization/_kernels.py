@@ -0,0 +1,56 @@
+"""
+Point transform kernels for the per-frame robot mesh update.
+
+`apply_link_poses` poses the points of every link in one call. With numba
+installed (``pip install robot_visualization[fast]``) it is a parallel JIT
+kernel, otherwise it falls back to one NumPy GEMM per link.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+
+def _apply_link_poses_numpy(points_in, poses, offsets, points_out):
+    """
+    Write points_in transformed per link into points_out.
+
+    Args:
+        points_in: (V, 3) float32 untransformed points of all links
+        poses: (L, 4, 4) float32 homogeneous transform per link
+        offsets: (L + 1,) int64 row offsets; link l owns rows offsets[l]:offsets[l + 1]
+        points_out: (V, 3) float32 output buffer
+    """
+    for link in range(len(poses)):
+        start, stop = offsets[link], offsets[link + 1]
+        out = points_out[start:stop]
+        np.dot(points_in[start:stop], poses[link, :3, :3].T, out=out)
+        out += poses[link, :3, 3]
+
+
+if njit is not None:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _apply_link_poses_numba(points_in, poses, offsets, points_out):
+        """Same as _apply_link_poses_numpy, parallel over the vertices of each link."""
+        for link in range(poses.shape[0]):
+            T = poses[link]
+            for i in prange(offsets[link], offsets[link + 1]):
+                x = points_in[i, 0]
+                y = points_in[i, 1]
+                z = points_in[i, 2]
+                points_out[i, 0] = T[0, 0] * x + T[0, 1] * y + T[0, 2] * z + T[0, 3]
+                points_out[i, 1] = T[1, 0] * x + T[1, 1] * y + T[1, 2] * z + T[1, 3]
+                points_out[i, 2] = T[2, 0] * x + T[2, 1] * y + T[2, 2] * z + T[2, 3]
+
+    # Compile (or load from cache) now rather than on the first robot update
+    _apply_link_poses_numba(np.zeros((1, 3), dtype=np.float32),
+                            np.eye(4, dtype=np.float32)[None],
+                            np.array([0, 1], dtype=np.int64),
+                            np.empty((1, 3), dtype=np.float32))
+    apply_link_poses = _apply_link_poses_numba
+else:
+    apply_link_poses = _apply_link_poses_numpy
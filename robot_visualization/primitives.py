@@ -62,28 +62,60 @@ class AxesVisualizer:
         if position is not None:
             self.origin = np.array(position)
         
-        # Default axis directions
-        axes_directions = [
-            np.array([self.scale, 0, 0]),  # X axis
-            np.array([0, self.scale, 0]),  # Y axis
-            np.array([0, 0, self.scale]),  # Z axis
-        ]
+        # Rotated axes are the columns of the scaled rotation matrix
+        if rotation is None:
+            R = np.eye(3)
+        elif isinstance(rotation, Rotation):
+            R = rotation.as_matrix()
+        else:
+            rotation = np.asarray(rotation)
+            R = Rotation.from_rotvec(rotation).as_matrix() if rotation.shape == (3,) else rotation
+        endpoints = self.origin + (R * self.scale).T
+
+        # Update axis endpoints in the point buffers of the stored meshes
+        for idx, mesh in enumerate(self.meshes):
+            points = mesh.points
+            points[0] = self.origin
+            points[1] = endpoints[idx]
+    
+    def batch_apply(self, positions, rotations):
+        """
+        Precompute axis endpoints for a whole trajectory in one vectorized pass.
         
-        # Apply Rodrigues rotation if provided
-        if rotation is not None:
-            if isinstance(rotation, np.ndarray) and rotation.shape == (3,):
-                rotation = Rotation.from_rotvec(rotation)
-            else:
-                rotation = Rotation.from_matrix(rotation)
-            axes_directions = [rotation.apply(direction) for direction in axes_directions]
+        Args:
+            positions: Origin positions, shape (N, 3)
+            rotations: Rotation object holding N rotations, Rodrigues vectors (N, 3)
+                or rotation matrices (N, 3, 3)
         
-        # Update axis endpoints directly on the stored mesh objects
-        for direction, idx in zip(axes_directions, range(3)):
-            self.meshes[idx].points = np.array([
-                self.origin,
-                self.origin + direction
-            ])
-    
+        Returns:
+            Endpoints of shape (N, 3, 2, 3) indexed as [frame, axis, start/end, xyz];
+            pass endpoints[n] to update_endpoints during playback
+        """
+        positions = np.asarray(positions, dtype=float)
+        if isinstance(rotations, Rotation):
+            R = rotations.as_matrix()
+        else:
+            rotations = np.asarray(rotations)
+            R = Rotation.from_rotvec(rotations).as_matrix() if rotations.ndim == 2 else rotations
+        R = R.reshape(-1, 3, 3)
+
+        endpoints = np.empty((len(positions), 3, 2, 3))
+        endpoints[:, :, 0] = positions[:, None]
+        # Row i of R^T is the rotated i-th axis
+        endpoints[:, :, 1] = positions[:, None] + self.scale * np.swapaxes(R, 1, 2)
+        return endpoints
+
+    def update_endpoints(self, endpoints):
+        """
+        Update the axes from precomputed endpoints.
+        
+        Args:
+            endpoints: One frame of batch_apply output, shape (3, 2, 3)
+        """
+        self.origin = np.array(endpoints[0, 0])
+        for mesh, axis_endpoints in zip(self.meshes, endpoints):
+            mesh.points[:] = axis_endpoints
+
     def plot_path(self, p1, p2, color='yellow', line_width=2):
         """
         Plot a path defined by a series of points.
@@ -121,8 +153,19 @@ class ArrowVisualizer:
     
     def _create_arrow(self):
         """Create the initial arrow actor."""
-        arrow = pv.Arrow(start=self.origin, direction=self.direction, scale=self.scale)
-        self.actor = self.plotter.add_mesh(arrow, color=self.color)
+        # Unit arrow along +x; updates rotate and scale these points in place
+        self.mesh = pv.Arrow(start=(0, 0, 0), direction=(1, 0, 0), scale=1.0)
+        self._canonical_points = self.mesh.points.copy()
+        self._place(self.scale)
+        self.actor = self.plotter.add_mesh(self.mesh, color=self.color)
+
+    def _place(self, length):
+        """Map the unit arrow onto the current origin and direction with the given length."""
+        transform = (_rotation_from_x(self.direction) * length).T.astype(np.float32)
+        points = self.mesh.points
+        np.dot(self._canonical_points, transform, out=points)
+        points += self.origin.astype(np.float32)
+        self.mesh.GetPoints().Modified()
     
     def update(self, origin=None, direction=None):
         """
@@ -137,8 +180,26 @@ class ArrowVisualizer:
         if direction is not None:
             self.direction = np.array(direction)
         
-        arrow = pv.Arrow(start=self.origin, direction=self.direction,scale= self.scale * np.linalg.norm(self.direction))
-        self.actor.mapper.dataset = arrow
+        self._place(self.scale * np.linalg.norm(self.direction))
+
+
+def _rotation_from_x(direction):
+    """Rotation matrix taking the +x axis onto `direction` (Rodrigues formula)."""
+    norm = np.linalg.norm(direction)
+    if norm == 0:
+        return np.eye(3)
+    u = np.asarray(direction, dtype=float) / norm
+    c = u[0]
+    if c < -1 + 1e-12:
+        # Antiparallel: half turn about z
+        return np.diag([-1.0, -1.0, 1.0])
+    # Axis x cross u = (0, -u_z, u_y), sine folded into the skew matrix
+    K = np.array([
+        [0, -u[1], -u[2]],
+        [u[1], 0, 0],
+        [u[2], 0, 0],
+    ])
+    return np.eye(3) + K + K @ K / (1 + c)
 
 class BoxVisualizer:
 
@@ -1,10 +1,30 @@
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+
 from urdfpy import URDF
 import pyvista as pv
 import numpy as np
 
+from ._kernels import apply_link_poses
+
+
+def _render_once(method):
+    """Run a Robot method inside batched_render(), so it triggers at most one render."""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.batched_render():
+            return method(self, *args, **kwargs)
+    return wrapper
+
 
 class Robot:
 
+    # Number of joint configurations whose FK results are kept
+    fk_cache_size = 8
+    # Unit-size end-effector marker meshes, built on first use by plot_ee
+    _marker_templates = {}
+
     def __init__(self, urdf_file : str, plotter=None, **kwargs):
         """
         Initialize the Robot class with a URDF file and a PyVista plotter.
@@ -39,8 +59,51 @@ class Robot:
         self.mesh_actors = {}
         self.id_list = []
         self.mesh_type = 'visual'  # 'visual' or 'collision'
+        # Small LRU of FK results keyed on the raw bytes of q
+        self._fk_cache = OrderedDict()
+        self.fk_cache_hits = 0
+        self.fk_cache_misses = 0
+        # Untransformed points of all links in one contiguous (V_total, 3)
+        # array; _link_slices holds (tm, start, stop) rows per link and
+        # _link_offsets the same bounds as an (L + 1,) array for the kernel
+        self._canonical_points = None
+        self._link_slices = []
+        self._link_offsets = None
+        # (L, 4, 4) float32 scratch buffer for the T0 @ pose of every link
+        self._poses_buf = None
+        # Per mesh id: (V_total, 3) buffer shared by that id's link meshes,
+        # and the (pv_mesh, actor) pairs in _link_slices order
+        self._points = {}
+        self._link_meshes = {}
+        # Per mesh id: cache key of the q its meshes are currently posed at
+        self._last_q = {}
+
+    def _cached_fk(self, key, compute):
+        """Return the cached FK result for `key`, computing and storing it on a miss."""
+        if key in self._fk_cache:
+            self.fk_cache_hits += 1
+            self._fk_cache.move_to_end(key)
+            return self._fk_cache[key]
+        self.fk_cache_misses += 1
+        value = compute()
+        self._fk_cache[key] = value
+        if len(self._fk_cache) > self.fk_cache_size:
+            self._fk_cache.popitem(last=False)
+        return value
+
+    @staticmethod
+    def _q_key(q):
+        """Hashable cache key for a joint configuration (array, dict or None)."""
+        if q is None:
+            return None
+        if isinstance(q, dict):
+            return tuple(sorted((getattr(joint, 'name', joint), float(value)) for joint, value in q.items()))
+        return np.asarray(q, dtype=float).tobytes()
 
     def _get_fk(self, q=None):
+        return self._cached_fk((self.mesh_type, self._q_key(q)), lambda: self._compute_fk(q))
+
+    def _compute_fk(self, q=None):
         if self.mesh_type == 'collision':
             fk = self.robot.collision_trimesh_fk(q)
             if not fk:
@@ -49,14 +112,52 @@ class Robot:
             fk = self.robot.visual_trimesh_fk(q)
         return fk
 
+    def _transform_links(self, fk, id):
+        """Write the canonical points of every link, posed by T0 @ fk[tm], into the buffer of `id`."""
+        np.matmul(self.T0, np.stack([fk[tm] for tm, start, stop in self._link_slices]),
+                  out=self._poses_buf)
+        apply_link_poses(self._canonical_points, self._poses_buf, self._link_offsets, self._points[id])
+        # In-place writes bypass pyvista's change tracking
+        for pv_mesh, actor in self._link_meshes[id]:
+            pv_mesh.GetPoints().Modified()
+
+    @contextmanager
+    def batched_render(self):
+        """
+        Suppress plotter renders inside the block and render once when it exits.
+
+        Opt-in for callers that add several actors at once (e.g. meshes for
+        multiple ids, end-effector markers). update() on existing meshes only
+        edits points in place and does not render by itself. Nested blocks
+        defer to the outermost one.
+        """
+        if self.plotter.suppress_rendering:
+            yield
+            return
+        self.plotter.suppress_rendering = True
+        try:
+            yield
+        finally:
+            self.plotter.suppress_rendering = False
+        self.plotter.render()
+
     def toggle_mesh_type(self):
         """Toggle between visual and collision meshes; caller must call update() afterwards."""
         for (tm, id_), (pv_mesh, actor) in list(self.mesh_actors.items()):
             self.plotter.remove_actor(actor)
         self.mesh_actors.clear()
         self.id_list.clear()
+        self._canonical_points = None
+        self._link_slices.clear()
+        self._link_offsets = None
+        self._poses_buf = None
+        self._points.clear()
+        self._link_meshes.clear()
+        self._last_q.clear()
+        self._fk_cache.clear()
         self.mesh_type = 'collision' if self.mesh_type == 'visual' else 'visual'
 
+    @_render_once
     def set_robot_mesh(self, id = 0, color= None, opacity=None):
 
         self.id_list.append(id)
@@ -68,28 +169,41 @@ class Robot:
 
         fk = self._get_fk()
 
+        # Convert trimeshes to pyvista meshes
+        pv_meshes = []
         for tm in fk:
-            pose = fk[tm]
-            # transform to base frame
-            pose = self.T0 @ pose
-            
-            # Convert trimesh to pyvista mesh
             pv_mesh = pv.wrap(tm)
             if self.decimate is not None:
                 pv_mesh = pv_mesh.decimate(self.decimate)
-            canonical_points = pv_mesh.points.copy()
-            # Apply pose transformation
-            transform = np.eye(4)
-            transform[:3, :3] = pose[:3, :3]
-            transform[:3, 3] = pose[:3, 3]
-            pv_mesh.transform(transform, inplace=True)
+            pv_meshes.append(pv_mesh)
+
+        if self._canonical_points is None:
+            self._canonical_points = np.ascontiguousarray(
+                np.concatenate([pv_mesh.points for pv_mesh in pv_meshes]), dtype=np.float32)
+            self._link_offsets = np.zeros(len(pv_meshes) + 1, dtype=np.int64)
+            np.cumsum([pv_mesh.n_points for pv_mesh in pv_meshes], out=self._link_offsets[1:])
+            self._link_slices = [(tm, start, stop) for tm, start, stop
+                                 in zip(fk, self._link_offsets[:-1].tolist(), self._link_offsets[1:].tolist())]
+            self._poses_buf = np.empty((len(pv_meshes), 4, 4), dtype=np.float32)
+
+        # Each link mesh's points are a view into this id's shared buffer, so
+        # the transform writes straight into the arrays VTK renders from
+        points = np.empty_like(self._canonical_points)
+        self._points[id] = points
+        self._link_meshes[id] = []
+        for (tm, start, stop), pv_mesh in zip(self._link_slices, pv_meshes):
+            pv_mesh.points = points[start:stop]
             # Add mesh to plotter
             actor = self.plotter.add_mesh(pv_mesh, color=color, opacity=opacity)
-            self.mesh_actors[(tm,id)] = (pv_mesh, actor, canonical_points)
+            self.mesh_actors[(tm,id)] = (pv_mesh, actor)
+            self._link_meshes[id].append((pv_mesh, actor))
+        self._transform_links(fk, id)
+        self._last_q[id] = self._q_key(None)
             
     def fk(self, q, ee_link_name="CS_6"):
         """Compute the world-frame pose of a link for a given joint configuration."""
-        pose = self.robot.link_fk(q, ee_link_name)
+        pose = self._cached_fk(('link', ee_link_name, self._q_key(q)),
+                               lambda: self.robot.link_fk(q, ee_link_name))
         # transform to base frame
         pose = self.T0 @ pose
         
@@ -102,26 +216,31 @@ class Robot:
         if id not in self.id_list:
             self.set_robot_mesh(id=id, color=color, opacity=opacity)
 
-        fk = self._get_fk(q)
-        for tm in fk:
-            pose = fk[tm]
-            # transform to base frame
-            pose = self.T0 @ pose
-
-            pv_mesh, actor, canonical_points = self.mesh_actors[(tm,id)]
-
-            # set color and opacity
-            if color is not None:
-                actor.GetProperty().SetColor(color[0], color[1], color[2])
-            if opacity is not None:
-                actor.GetProperty().SetOpacity(opacity)
-            # Reset mesh to canonical zero-pose and apply new pose
-            pv_mesh.points = canonical_points.copy()
-            transform = np.eye(4)
-            transform[:3, :3] = pose[:3, :3]
-            transform[:3, 3] = pose[:3, 3]  
-            pv_mesh.transform(transform, inplace=True)
-            # No need to update actor, as mesh is updated in-place
+        # set color and opacity
+        if color is not None or opacity is not None:
+            for pv_mesh, actor in self._link_meshes[id]:
+                if color is not None:
+                    actor.GetProperty().SetColor(color[0], color[1], color[2])
+                if opacity is not None:
+                    actor.GetProperty().SetOpacity(opacity)
+
+        # Skip FK and the mesh transform if this id is already posed at q,
+        # e.g. on redraws triggered by camera moves only
+        q_key = self._q_key(q)
+        if id in self._last_q and self._last_q[id] == q_key:
+            return
+
+        # No need to update actors, as meshes are updated in-place
+        self._transform_links(self._get_fk(q), id)
+        # Record q only once the meshes are actually posed at it
+        self._last_q[id] = q_key
+
+    @classmethod
+    def _marker_template(cls, type):
+        """Unit-diameter sphere or unit cube centred at the origin, shared by all robots."""
+        if type not in cls._marker_templates:
+            cls._marker_templates[type] = pv.Sphere(radius=0.5) if type == "sphere" else pv.Cube()
+        return cls._marker_templates[type]
 
     def plot_ee(self, q, Tgp = np.eye(4), ee_link_name="CS_6", color="red", plotter=None, **kwargs):
         """
@@ -144,39 +263,45 @@ class Robot:
         size = kwargs.get("size", 0.01)
         type = kwargs.get("type", "sphere")
 
-        if type == "sphere":
-            sphere = pv.Sphere(radius=size / 2, center=ee_pos)
-            plotter.add_mesh(sphere, color=color)
-        elif type == "cube":
-            cube = pv.Cube(center=ee_pos, x_length=size, y_length=size, z_length=size)
-            plotter.add_mesh(cube, color=color)
+        if type in ("sphere", "cube"):
+            # Scale and translate a copy of the cached unit marker in place
+            marker = self._marker_template(type).copy()
+            points = marker.points
+            points *= size
+            points += ee_pos
+            marker.GetPoints().Modified()
+            plotter.add_mesh(marker, color=color)
         elif type == "cross":
-            line1 = pv.Line(
-                ee_pos - np.array([size / 2, 0, 0]), ee_pos + np.array([size / 2, 0, 0])
-            )
-            line2 = pv.Line(
-                ee_pos - np.array([0, size / 2, 0]), ee_pos + np.array([0, size / 2, 0])
-            )
-            line3 = pv.Line(
-                ee_pos - np.array([0, 0, size / 2]), ee_pos + np.array([0, 0, size / 2])
-            )
-            plotter.add_mesh(line1, color=color, line_width=4)
-            plotter.add_mesh(line2, color=color, line_width=4)
-            plotter.add_mesh(line3, color=color, line_width=4)
+            # Three axis-aligned segments as line cells of one mesh (single actor)
+            offsets = np.eye(3) * (size / 2)
+            points = np.empty((6, 3))
+            points[0::2] = ee_pos - offsets
+            points[1::2] = ee_pos + offsets
+            cross = pv.PolyData(points, lines=np.array([2, 0, 1, 2, 2, 3, 2, 4, 5]))
+            plotter.add_mesh(cross, color=color, line_width=4)
     
-    def plot_ee_frame(self, q, Tgp = np.eye(4), ee_link_name="CS_6", plotter=None, color = None, scale =0.1):
+    def plot_ee_frame(self, q, Tgp = np.eye(4), ee_link_name="CS_6", plotter=None, color = None, scale =0.1, actor=None):
         """
         Plot the end-effector frame for a given joint configuration.
 
         Args:
             q (np.ndarray): Joint configuration of the robot.
             ee_link_name (str): Name of the end-effector link.
+            actor (pv.AxesAssembly, optional): Frame returned by a previous call; it is
+                moved to the new pose in place instead of adding a new one.
+
+        Returns:
+            pv.AxesAssembly: The frame actor.
         """
         if plotter is None:
             plotter = self.plotter
 
         pose = self.fk(q, ee_link_name) @ Tgp
 
+        if actor is not None:
+            actor.user_matrix = pose
+            return actor
+
         axes = pv.AxesAssembly(
             user_matrix=pose,
             scale=scale,
@@ -184,6 +309,7 @@ class Robot:
             **({"x_color": color, "y_color": color, "z_color": color} if color is not None else {}),
         )
         plotter.add_actor(axes)
+        return axes
 
     def plot_path(self, points, actor = None, color:str =None, opacity=None, line_width=4, plotter=None):
         """
@@ -202,11 +328,22 @@ class Robot:
         if len(points) < 2:
             return actor
 
-        mesh = pv.lines_from_points(points, close=False)
+        n_points = len(points)
+        if actor is not None and actor.mapper.dataset.n_points == n_points:
+            # Same vertex count: overwrite the existing polyline's points in place
+            actor.mapper.dataset.points[:] = points
+            return actor
+
+        # Single polyline cell in VTK connectivity format [n, 0, 1, ..., n - 1]
+        lines = np.empty(n_points + 1, dtype=np.int64)
+        lines[0] = n_points
+        lines[1:] = np.arange(n_points)
+        # Copy so the mesh owns its points; the in-place branch above writes into them
+        mesh = pv.PolyData(points.copy(), lines=lines)
         if actor is None:
             actor = plotter.add_mesh(mesh, color=color, line_width=line_width, opacity=opacity)
         else:
-            actor.mapper.SetInputData(mesh)
+            actor.mapper.dataset = mesh
 
         return actor
 
@@ -214,5 +351,18 @@ class Robot:
         """
         Plot the end-effector path for a given sequence of joint configurations.
         """
-        pos = [(self.fk(q, ee_link_name) @ Tgp)[:3, 3] for q in path]
+        Tgp = np.asarray(Tgp)
+        if not hasattr(path, "__len__"):
+            # Iterators and generators: materialize for the batched FK
+            path = list(path)
+        if len(path) == 0:
+            return actor
+
+        # One batched FK pass over the whole path instead of a link_fk per pose
+        poses = self.robot.link_fk_batch(path, link=ee_link_name)
+        np.matmul(self.T0, poses, out=poses)
+        # Gripper positions R @ p_gp + p, written into one preallocated (N, 3) buffer
+        pos = np.empty((len(poses), 3))
+        np.matmul(poses[:, :3, :3], Tgp[:3, 3], out=pos)
+        pos += poses[:, :3, 3]
         return self.plot_path(pos, actor=actor, color=color, opacity=opacity, line_width=line_width, plotter=plotter)
\ No newline at end of file
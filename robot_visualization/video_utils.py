@@ -5,7 +5,7 @@ This module provides common functionality for video generation and
 frame processing used across visualization tools.
 """
 
-from typing import Tuple
+from typing import Tuple, Union
 import cv2
 import numpy as np
 
@@ -14,45 +14,59 @@ def calculate_fps_from_timestamps(time_ms: np.ndarray) -> float:
     """
     Calculate FPS from timestamp array.
 
+    Uses the median frame interval, so a single irregular gap (e.g. at the
+    start or end of a capture) does not skew the result.
+
     Args:
         time_ms: Array of timestamps in milliseconds
 
     Returns:
         Calculated FPS
     """
-    if len(time_ms) < 2:
+    dt = np.diff(np.asarray(time_ms, dtype=float))
+    if dt.size == 0:
         return 30.0  # Default fallback
 
-    t_end = time_ms[-1]
-    fps = len(time_ms) / (t_end / 1000.0)
-    return fps
+    median_dt = np.median(dt)
+    return 1000.0 / median_dt if median_dt > 0 else 30.0
 
 
 def add_timestamp_to_frame(
-    frame: np.ndarray,
+    frame: Union[np.ndarray, cv2.UMat],
     timestamp_ms: float,
     position: Tuple[int, int] = (20, 30),
     font_scale: float = 1.0,
     color: Tuple[int, int, int] = (255, 255, 255),
-    thickness: int = 1
-) -> np.ndarray:
+    thickness: int = 1,
+    use_umat: bool = False
+) -> Union[np.ndarray, cv2.UMat]:
     """
     Add timestamp overlay to frame.
 
+    A cv2.UMat frame is drawn on in place and returned as a UMat, so frames
+    already on an OpenCL device are not downloaded.
+
     Args:
-        frame: Input frame
+        frame: Input frame (ndarray or cv2.UMat)
         timestamp_ms: Timestamp in milliseconds
         position: Text position (x, y)
         font_scale: Font scale factor
         color: Text color (BGR)
         thickness: Text thickness
+        use_umat: Upload an ndarray frame to a cv2.UMat, draw there and
+            download the result (the input frame is left unmodified). This
+            costs a full-frame upload and download per call and is much
+            slower than drawing on the ndarray directly; it only exists for
+            pipelines that want the result to come from the OpenCL path
 
     Returns:
         Frame with timestamp overlay
     """
     formatted_timestamp = f"{int(timestamp_ms):04d}"
+    download = use_umat and not isinstance(frame, cv2.UMat)
+    target = cv2.UMat(frame) if download else frame
     cv2.putText(
-        frame,
+        target,
         f"Time: {formatted_timestamp} ms",
         position,
         cv2.FONT_HERSHEY_SIMPLEX,
@@ -61,7 +75,7 @@ def add_timestamp_to_frame(
         thickness,
         cv2.LINE_AA,
     )
-    return frame
+    return target.get() if download else frame
 
 
 def create_video_writer(